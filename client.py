@@ -1,17 +1,17 @@
 # 导入必要的模块和类型
 import asyncio
+import logging
 import sys
 import os
 from mcp import ClientSession, StdioServerParameters, types
 from mcp.client.stdio import stdio_client
 
-# 设置 Windows 特定的事件循环策略
-if sys.platform == "win32":
-    asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-
-# 创建主事件循环
-loop = asyncio.new_event_loop()
-asyncio.set_event_loop(loop)
+# 日志输出到 stderr，避免与 stdout 混用；通过 LOG_LEVEL 控制输出级别（不区分大小写，无效时使用 WARNING）
+log_level = logging.getLevelName(os.getenv("LOG_LEVEL", "WARNING").upper())
+if not isinstance(log_level, int):
+    log_level = logging.WARNING
+logging.basicConfig(level=log_level, stream=sys.stderr)
+log = logging.getLogger("client")
 
 DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL", "https://discord.com/api/webhooks/1363559361536069834/EOaSnGl4BUifN9n7XscAhuLPnKQ3fHmBeAygmppHBZdGIX19RXltp3UdGmKBB_RRBbIR")
 
@@ -42,23 +42,23 @@ async def handle_sampling_message(
 # 主运行函数
 async def run():
     try:
-        print("正在启动客户端...")
+        log.info("正在启动客户端...")
         # 使用标准的嵌套异步上下文管理器
         async with stdio_client(server_params) as (read, write):
-            print("已建立连接")
+            log.info("已建立连接")
             async with ClientSession(
                 read, write, sampling_callback=handle_sampling_message
             ) as session:
-                print("正在初始化会话...")
+                log.info("正在初始化会话...")
                 await session.initialize()
 
                 # 列出所有可用的工具
-                print("正在获取工具列表...")
+                log.info("正在获取工具列表...")
                 tools = await session.list_tools()
-                print("可用的工具:", tools)
+                log.info("可用的工具: %s", tools)
 
                 # 调用特定工具并传入参数
-                print("正在调用工具...")
+                log.info("正在调用工具...")
                 result = await session.call_tool(
                     "send_message", 
                     arguments={
@@ -66,32 +66,25 @@ async def run():
                         "content": '# 今日黄金\n## 今日黄金价格1060元！'
                     }
                 )
+                # 工具调用结果是演示的输出，直接写到本进程的 stdout（服务器通过独立的子进程管道通信）
                 print("工具调用结果:", result)
                 
-            print("会话已关闭") # Session closed by context manager
-        print("客户端连接已关闭") # Client connection closed by context manager
+            log.info("会话已关闭") # Session closed by context manager
+        log.info("客户端连接已关闭") # Client connection closed by context manager
 
     except Exception as e:
-        print(f"客户端运行时出错: {str(e)}", file=sys.stderr)
+        log.error("客户端运行时出错: %s", e)
         # 异常信息会在协程退出时打印
     finally:
-        # 确保所有资源都被正确清理
-        if 'session' in locals():
-            await session.close()
-        print("客户端完成")
+        # 会话和连接已由 async with 上下文管理器关闭
+        log.info("客户端完成")
 
 # 程序入口点
 if __name__ == "__main__":
     try:
-        loop.run_until_complete(run())
+        asyncio.run(run())
     except KeyboardInterrupt:
-        print("\n程序被用户中断")
+        log.warning("程序被用户中断")
     except Exception as e:
         # 捕获 asyncio.run 可能引发的顶层异常
-        print(f"程序顶层运行出错: {str(e)}", file=sys.stderr)
-    finally:
-        # 清理事件循环
-        try:
-            loop.close()
-        except Exception:
-            pass
\ No newline at end of file
+        log.error("程序顶层运行出错: %s", e)
\ No newline at end of file
@@ -1,16 +1,66 @@
+import asyncio
+import logging
 import os
-from typing import Dict, Any, Optional
+import sys
+import orjson
+from typing import Callable, Optional
 from pydantic import BaseModel, Field
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.shared.exceptions import McpError
 from mcp.types import Tool, TextContent, ErrorData, INVALID_PARAMS, INTERNAL_ERROR
-from httpx import AsyncClient, HTTPError
+from httpx import URL, AsyncClient, HTTPError, InvalidURL, Limits, Timeout
+
+logger = logging.getLogger(__name__)
+
+def _identity(content: str) -> str:
+    """原样返回消息内容，Discord的content字段直接支持markdown"""
+    return content
+
+# 支持的消息类型及对应的内容格式化函数，新增格式时在此注册
+_FORMATTERS: dict[str, Callable[[str], str]] = {
+    "text": _identity,
+    "markdown": _identity,
+}
+# 工具描述中展示的消息类型列表，随 _FORMATTERS 自动更新
+_MSG_TYPES_TEXT = "和".join(_FORMATTERS)
+
+# send_message 工具的参数结构，内容不可变，导入时构建一次
+_INPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "content": {
+            "type": "string",
+            "description": "消息内容"
+        },
+        "msg_type": {
+            "type": "string",
+            "description": f"消息类型，支持{_MSG_TYPES_TEXT}",
+            "default": "text",
+            "enum": list(_FORMATTERS)
+        }
+    },
+    "required": ["content"]
+}
+
+# 工具定义在导入时构建一次，list_tools 直接返回同一列表
+_SEND_MESSAGE_TOOL = Tool(
+    name="send_message",
+    description=f"发送消息到Discord，支持{_MSG_TYPES_TEXT}格式",
+    inputSchema=_INPUT_SCHEMA
+)
+_TOOLS_LIST = [_SEND_MESSAGE_TOOL]
+
+# 同时进行中的webhook请求上限
+_MAX_CONCURRENT_SENDS = 10
+
+# 发送成功时复用的工具返回结果，失败时以McpError抛出
+_SUCCESS_RESPONSE = [TextContent(type="text", text="消息发送成功")]
 
 class DiscordMessage(BaseModel):
     """Discord webhook消息模型
     
-    用于构建发送到Discord的消息结构
+    用于构建发送到Discord的消息结构，仅为外部API兼容保留，发送路径不再使用
     Attributes:
         content: 消息内容
         type: 消息类型，目前支持text和markdown两种格式
@@ -26,6 +76,7 @@ class DiscordWebhook:
     Attributes:
         webhook_url: Discord webhook的URL地址
         client: HTTP客户端实例，用于发送请求
+        send_semaphore: 限制同时进行中的webhook请求数量
     """
     
     def __init__(self, webhook_url: str, client: AsyncClient):
@@ -42,14 +93,15 @@ class DiscordWebhook:
             raise ValueError("webhook_url不能为空")
         self.webhook_url = webhook_url
         self.client = client
+        self.send_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_SENDS)
 
-    async def send_message(self, message: DiscordMessage) -> bool:
+    async def send_message(self, content: str) -> bool:
         """发送消息到Discord
         
         通过webhook API发送消息到指定的Discord频道
         
         Args:
-            message: 要发送的消息对象
+            content: 消息内容
             
         Returns:
             bool: 发送是否成功
@@ -58,14 +110,13 @@ class DiscordWebhook:
             McpError: 当发送失败时抛出，包含错误详情
         """
         try:
-            # Discord webhook 只需要 content 字段
-            payload = {"content": message.content}
-            response = await self.client.post(
-                self.webhook_url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=30
-            )
+            # Discord webhook 只需要 content 字段，使用 orjson 预先序列化请求体
+            body = orjson.dumps({"content": content})
+            # 请求头和超时由共享的 AsyncClient 统一配置
+            async with self.send_semaphore:
+                response = await self.client.post(self.webhook_url, content=body)
+            logger.debug("webhook响应协议: %s", response.http_version)
+            # 成功时Discord返回204且无响应体，只在出错时读取响应文本
             if response.status_code >= 400:
                 raise McpError(ErrorData(
                     code=INTERNAL_ERROR,
@@ -73,15 +124,12 @@ class DiscordWebhook:
                 ))
             return True
         except HTTPError as e:
+            # mcp只把str(McpError)返回给客户端，原始异常在此记录
+            logger.warning("发送消息失败", exc_info=e)
             raise McpError(ErrorData(
                 code=INTERNAL_ERROR,
-                message=f"发送消息失败: {str(e)}"
-            ))
-        except Exception as e:
-            raise McpError(ErrorData(
-                code=INTERNAL_ERROR,
-                message=f"发送消息时发生未知错误: {str(e)}"
-            ))
+                message=f"发送消息失败: {type(e).__name__}"
+            )) from e
 
 class DiscordTools:
     """Discord工具函数类
@@ -100,7 +148,7 @@ class DiscordTools:
         """
         self.webhook = webhook
         
-    async def send_message(self, content: str, msg_type: str = "text") -> Dict[str, Any]:
+    async def send_message(self, content: str, msg_type: str = "text") -> list[TextContent]:
         """发送消息工具函数
         
         提供更友好的接口来发送消息，支持不同的消息类型
@@ -110,24 +158,43 @@ class DiscordTools:
             msg_type: 消息类型，支持text和markdown
             
         Returns:
-            Dict[str, Any]: 包含发送结果的字典
+            list[TextContent]: 发送成功的结果
             
         Raises:
-            McpError: 当消息类型不支持或发送失败时抛出
+            McpError: 当消息内容不是字符串、消息类型不支持或发送失败时抛出
         """
-        if msg_type not in ["text", "markdown"]:
+        if not isinstance(content, str):
             raise McpError(ErrorData(
                 code=INVALID_PARAMS,
-                message=f"不支持的消息类型: {msg_type}"
+                message="消息内容必须为字符串"
             ))
-            
-        message = DiscordMessage(content=content, type=msg_type)
-        success = await self.webhook.send_message(message)
-        
-        return {
-            "success": success,
-            "message": "消息发送成功" if success else "消息发送失败"
-        }
+
+        try:
+            formatter = _FORMATTERS[msg_type]
+        except (KeyError, TypeError):
+            raise McpError(ErrorData(
+                code=INVALID_PARAMS,
+                message=f"不支持的消息类型: {msg_type}"
+            )) from None
+        content = formatter(content)
+
+        await self.webhook.send_message(content)
+        return _SUCCESS_RESPONSE
+
+async def _prewarm(client: AsyncClient, webhook_url: str) -> None:
+    """预热到webhook主机的连接
+
+    启动时向webhook所在主机发送一次HEAD请求，使首条消息发送时连接池中已有建立好的连接
+
+    Args:
+        client: 共享的HTTP客户端实例
+        webhook_url: Discord webhook的URL地址
+    """
+    try:
+        await client.head(URL(webhook_url).join("/"), timeout=5.0)
+    except (HTTPError, InvalidURL):
+        # 预热失败不影响正常发送，首条消息会重新建立连接
+        pass
 
 async def serve(
     webhook_url: Optional[str] = None,
@@ -147,9 +214,22 @@ async def serve(
         raise ValueError("必须提供DISCORD_WEBHOOK_URL环境变量或通过参数传入webhook_url")
         
     server = Server("discord-mcp")
-    # 显式创建 AsyncClient
-    http_client = AsyncClient()
+    # 显式创建 AsyncClient，整个服务器生命周期内复用同一连接池
+    # 启用 HTTP/2 后并发请求在同一连接上多路复用
+    http_client = AsyncClient(
+        http2=True,
+        limits=Limits(
+            max_keepalive_connections=20,
+            max_connections=100,
+            keepalive_expiry=30.0
+        ),
+        timeout=Timeout(30.0, connect=5.0),
+        headers={"Content-Type": "application/json"}
+    )
     
+    # 在后台预热连接，不阻塞服务器启动
+    prewarm = asyncio.create_task(_prewarm(http_client, webhook_url))
+
     # 创建 webhook 和 tools 实例，并运行服务器
     webhook = DiscordWebhook(webhook_url, http_client)
     tools = DiscordTools(webhook)
@@ -161,34 +241,41 @@ async def serve(
         Returns:
             list[Tool]: 可用工具列表，目前只包含send_message工具
         """
-        return [
-            Tool(
-                name="send_message",
-                description="发送消息到Discord，支持text和markdown格式",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "content": {
-                            "type": "string",
-                            "description": "消息内容"
-                        },
-                        "msg_type": {
-                            "type": "string",
-                            "description": "消息类型，支持text和markdown",
-                            "default": "text",
-                            "enum": ["text", "markdown"]
-                        }
-                    },
-                    "required": ["content"]
-                }
-            )
-        ]
+        return _TOOLS_LIST
+
+    async def send_message(arguments: dict) -> list[TextContent]:
+        """处理send_message工具调用
+
+        Args:
+            arguments: 工具参数
+
+        Returns:
+            list[TextContent]: 工具执行结果
+
+        Raises:
+            McpError: 当缺少消息内容或发送失败时抛出
+        """
+        try:
+            content = arguments["content"]
+        except KeyError:
+            raise McpError(ErrorData(
+                code=INVALID_PARAMS,
+                message="消息内容不能为空"
+            )) from None
+
+        return await tools.send_message(
+            content=content,
+            msg_type=arguments.get("msg_type", "text")
+        )
+
+    # 工具名称到处理函数的映射，新增工具时在此注册
+    tool_handlers = {"send_message": send_message}
 
     @server.call_tool()
     async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         """调用工具函数
         
-        处理工具调用请求，目前只支持send_message工具
+        按工具名称分发工具调用请求，目前只支持send_message工具
         
         Args:
             name: 工具名称
@@ -200,45 +287,61 @@ async def serve(
         Raises:
             McpError: 当工具名称无效或参数错误时抛出
         """
-        if name != "send_message":
+        try:
+            handler = tool_handlers[name]
+        except KeyError:
             raise McpError(ErrorData(
                 code=INVALID_PARAMS,
                 message=f"未知的工具名称: {name}"
-            ))
-            
-        if "content" not in arguments:
-            raise McpError(ErrorData(
-                code=INVALID_PARAMS,
-                message="消息内容不能为空"
-            ))
-            
-        result = await tools.send_message(
-            content=arguments["content"],
-            msg_type=arguments.get("msg_type", "text")
-        )
-        
-        return [TextContent(type="text", text=result["message"])]
+            )) from None
+
+        return await handler(arguments)
+
     try:
         options = server.create_initialization_options()
         async with stdio_server() as (read_stream, write_stream):
                 await server.run(read_stream, write_stream, options, raise_exceptions=True)
     finally:
+        prewarm.cancel()
         # 确保 AsyncClient 在 server.run 结束后关闭
         if http_client:
             await http_client.aclose()
 
+def _event_loop_factory() -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """选择可选的高性能事件循环工厂
+
+    POSIX平台使用uvloop，Windows平台使用winloop；Python 3.10没有asyncio.Runner，
+    未安装时或在3.10上返回None，保留默认事件循环
+
+    Returns:
+        Optional[Callable[[], asyncio.AbstractEventLoop]]: 事件循环工厂，不可用时为None
+    """
+    if sys.version_info < (3, 11):
+        return None
+    try:
+        if sys.platform == "win32":
+            import winloop
+            return winloop.new_event_loop
+        import uvloop
+        return uvloop.new_event_loop
+    except ImportError:
+        return None
+
 def main():
     """主函数
     
     程序入口点，处理命令行参数并启动服务器
     """
-    import asyncio
-    import sys
     if len(sys.argv) > 1 :
         webhook_url = sys.argv[1]
     else:
         webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
-    asyncio.run(serve(webhook_url))
+    loop_factory = _event_loop_factory()
+    if loop_factory is None:
+        asyncio.run(serve(webhook_url))
+    else:
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(serve(webhook_url))
 
 if __name__ == "__main__":
     main()